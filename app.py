@@ -1,8 +1,17 @@
+import json
 import logging
+import os
+import time
+import unicodedata
 from pathlib import Path
+from urllib.parse import quote
+from celery import uuid
+from celery.result import AsyncResult
 from flask import (Flask, render_template, request, redirect, url_for,
-                   flash, send_from_directory, g)
-import downloader
+                   flash, send_from_directory, Response, abort,
+                   stream_with_context)
+from werkzeug.security import safe_join
+from tasks import celery_app, download_single_task
 
 app = Flask(__name__)
 # Para produção, use uma chave secreta real e carregue-a de uma variável de ambiente
@@ -12,6 +21,18 @@ app.secret_key = "uma-chave-secreta-muito-melhor-do-que-a-padrao"
 DOWNLOAD_DIR = Path("downloads")
 DOWNLOAD_DIR.mkdir(exist_ok=True)
 
+# Em produção o nginx entrega os arquivos (sendfile) a partir de um location interno,
+# p.ex. X_ACCEL_PREFIX=/protected com:
+#   location /protected/ { internal; alias /var/app/downloads/; }
+# Sem a variável, o próprio Flask serve os arquivos.
+app.config["X_ACCEL_PREFIX"] = os.getenv("X_ACCEL_PREFIX")
+
+# Progresso via SSE: duração de cada conexão, intervalo de reconexão do navegador
+# e por quanto tempo uma tarefa pode ficar em PENDING antes de ser dada como perdida
+SSE_STREAM_MAX = 25         # segundos
+SSE_RETRY_MS = 1000
+SSE_PENDING_TIMEOUT = 600   # segundos
+
 # Configuração básica de logging para depuração
 logging.basicConfig(level=logging.INFO)
 
@@ -25,39 +46,100 @@ def index():
             flash("Por favor, insira uma URL válida.")
             return redirect(url_for("index"))
 
-        try:
-            # Chama a função de download
-            # Nota: Isso ainda é uma operação bloqueante.
-            # Para uma aplicação real, use uma fila de tarefas (Celery, RQ).
-            logging.info(f"Iniciando download para URL: {url} com qualidade {qualidade}")
-            downloaded_file = downloader.download_single(
-                url=url,
-                outdir=DOWNLOAD_DIR,
-                qualidade=qualidade,
-            )
+        # O download roda em um worker Celery; a requisição só enfileira a tarefa.
+        logging.info(f"Enfileirando download para URL: {url} com qualidade {qualidade}")
+        # QUEUED é gravado antes de enfileirar (senão poderia sobrescrever o estado
+        # já gravado pelo worker): assim, PENDING só sobra para ids desconhecidos/expirados.
+        task_id = uuid()
+        celery_app.backend.store_result(task_id, None, "QUEUED")
+        download_single_task.apply_async(
+            (url, str(DOWNLOAD_DIR.resolve()), qualidade), task_id=task_id
+        )
+        return redirect(url_for("status", task_id=task_id))
 
-            if downloaded_file:
-                flash("✅ Download concluído com sucesso!")
-                # Armazena o nome do arquivo para ser usado no template
-                g.filename = downloaded_file.name
-            else:
-                flash("❌ Ocorreu um erro e o download não foi concluído.")
+    return render_template("index.html", filename=None, task_id=None)
 
-        except Exception as e:
-            logging.error(f"Erro ao baixar URL {url}: {e}", exc_info=True)
-            flash(f"❌ Erro ao baixar: {str(e)}")
+@app.route("/status/<task_id>")
+def status(task_id):
+    """Página que acompanha o andamento de uma tarefa de download."""
+    return render_template("index.html", filename=None, task_id=task_id)
 
-        # Renderiza a mesma página, agora com o link de download (se houver)
-        return render_template("index.html", filename=getattr(g, 'filename', None))
+def _task_payload(res: AsyncResult) -> dict:
+    """Estado da tarefa no formato consumido pelo template."""
+    data = {"state": res.state, "meta": res.info if isinstance(res.info, dict) else {}}
+    if res.successful():
+        data["filename"] = res.result
+        if res.result:
+            data["url"] = url_for("download_file", filename=res.result)
+    elif res.failed():
+        data["error"] = str(res.result)
+    return data
 
-    return render_template("index.html", filename=None)
+@app.route("/progress/<task_id>")
+def progress(task_id):
+    """
+    Server-Sent Events com o andamento da tarefa.
+    Cada conexão dura no máximo SSE_STREAM_MAX segundos (abaixo do timeout do
+    gunicorn); o navegador reconecta sozinho após SSE_RETRY_MS. O `id` dos eventos
+    guarda quando a tarefa começou a ser acompanhada, para que uma tarefa presa em
+    PENDING encerre após SSE_PENDING_TIMEOUT. Tarefas aguardando na fila aparecem
+    como QUEUED (gravado em index()), então PENDING significa id desconhecido ou
+    resultado expirado.
+    """
+    try:
+        watching_since = float(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        watching_since = time.time()
+
+    def gen():
+        opened = time.time()
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        last = None
+        while True:
+            res = AsyncResult(task_id, app=celery_app)
+            data = _task_payload(res)
+            done = res.ready()
+            if res.state == "PENDING" and time.time() - watching_since > SSE_PENDING_TIMEOUT:
+                data = {"state": "EXPIRED", "meta": {}}
+                done = True
+            payload = json.dumps(data)
+            if payload != last:
+                yield f"id: {watching_since}\ndata: {payload}\n\n"
+                last = payload
+            else:
+                yield ": keep-alive\n\n"
+            if done or time.time() - opened > SSE_STREAM_MAX:
+                break
+            time.sleep(0.5)
+
+    resp = Response(stream_with_context(gen()), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # nginx não deve segurar o stream
+    return resp
 
 @app.route("/downloads/<path:filename>")
 def download_file(filename):
     """Rota para servir os arquivos baixados."""
-    try:
-        return send_from_directory(
-            DOWNLOAD_DIR, filename, as_attachment=True
-        )
-    except FileNotFoundError:
-        return "Arquivo não encontrado.", 404
\ No newline at end of file
+    prefix = app.config.get("X_ACCEL_PREFIX")
+    if app.debug or not prefix:
+        # Servidor de desenvolvimento: o próprio Flask envia o arquivo
+        try:
+            return send_from_directory(
+                DOWNLOAD_DIR, filename, as_attachment=True
+            )
+        except FileNotFoundError:
+            return "Arquivo não encontrado.", 404
+
+    path = safe_join(str(DOWNLOAD_DIR), filename)
+    if path is None:
+        abort(404)
+    if not os.path.isfile(path):
+        return "Arquivo não encontrado.", 404
+    resp = Response()
+    resp.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(filename)}"
+    name = Path(filename).name
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    resp.headers["Content-Disposition"] = (
+        f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(name)}"
+    )
+    return resp
@@ -15,25 +15,79 @@ Uso rápido:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import errno
+import functools
+import json
 import logging
-import math
+import mmap
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import uuid
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Tuple, List
+from urllib.error import HTTPError
 
+import aiofiles
+import aiohttp
 from pytubefix import YouTube, Playlist
+from pytubefix import request as pytube_request
+from pytubefix.exceptions import RegexMatchError
+
+log = logging.getLogger(__name__)
 
 # ======================== Config / Constantes ========================
 
 QUALIDADES = ("best", "2160p", "1440p", "1080p", "720p", "480p", "360p")
-INVALID_CHARS = r'<>:"/\\|?*\0'
-INVALID_RE = re.compile(rf"[{re.escape(INVALID_CHARS)}]")
+_QUALIDADES_SET = frozenset(QUALIDADES)
+INVALID_CHARS = '<>:"/\\|?*\0'
+_TRANS = str.maketrans({c: "_" for c in INVALID_CHARS})
+_WS_RE = re.compile(r"\s+")
+PLAYLIST_WORKERS = 4
+TENTATIVAS = 3
+PLAYLIST_CACHE_DIR = ".playlist_cache"
+PLAYLIST_CACHE_TTL = 24 * 3600   # segundos
+_PLAYLIST_ID_RE = re.compile(r"list=([^&]+)")
+RANGE_SIZE = 10 * 1024 * 1024   # bytes por requisição HTTP de range
+WRITE_BUFFER = 64 * 1024        # buffer do arquivo de saída
+ASYNC_CHUNK = 1024 * 1024       # leitura do corpo HTTP no caminho assíncrono
+# Sem limite total por range (conexões lentas levam minutos em 10 MiB); só conexão e leitura ociosa
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+DIRECT_MIN_SIZE = 100 * 1024 * 1024  # acima disso, grava com O_DIRECT (Linux)
+DIRECT_ALIGN = 4096
+DIRECT_CHUNK = 1024 * 1024
+_DIRECT_UNSUPPORTED = (errno.EINVAL, errno.EOPNOTSUPP)
+HW_VIDEO_ENCODERS = ("h264_nvenc", "h264_qsv")
+# Mensagens do ffmpeg que indicam encoder/dispositivo indisponível (não erro de entrada)
+_ENCODER_ERROR_RE = re.compile(
+    r"Error while opening encoder|Error initializing output stream"
+    r"|No (?:NVENC )?capable devices|Cannot load lib(?:cuda|nvidia-encode)"
+    r"|OpenEncodeSessionEx failed|Device creation failed|Failed to create .*device"
+    r"|internal MFX session",
+    re.IGNORECASE,
+)
+REPORT_BYTES = 1024 * 1024      # progresso: reporta após 1 MiB novo...
+REPORT_INTERVAL = 0.25          # ...e 0,25 s desde o último report
+
+pytube_request.default_range_size = RANGE_SIZE
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Nomes já escolhidos por downloads em andamento (playlist em paralelo)
+_RESERVED_PATHS: set[Path] = set()
+_RESERVED_LOCK = threading.Lock()
 
 # ======================== Utilidades ========================
 
@@ -56,17 +110,15 @@ def default_download_dir() -> Path:
         try:
             d.mkdir(parents=True, exist_ok=True)
             # Teste rápido de escrita
-            p = d / ".probe_write"
-            p.write_text("ok", encoding="utf-8")
-            p.unlink(missing_ok=True)
-            return d
+            if os.access(d, os.W_OK):
+                return d
         except Exception:
             continue
     return Path.cwd()
 
 def sanitize_filename(name: str, max_len: int = 120) -> str:
-    name = INVALID_RE.sub("_", (name or "video")).strip().strip(".")
-    name = re.sub(r"\s+", " ", name)
+    name = (name or "video").translate(_TRANS).strip().strip(".")
+    name = _WS_RE.sub(" ", name)
     return name[:max_len] if len(name) > max_len else name
 
 def human_time(seconds: int) -> str:
@@ -76,15 +128,63 @@ def human_time(seconds: int) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
 
 def dedupe_path(base: Path) -> Path:
-    if not base.exists():
-        return base
-    stem, suffix = base.stem, base.suffix
-    n = 1
+    """
+    Retorna `base` se estiver livre; senão, acrescenta um sufixo aleatório ao nome.
+    O nome escolhido fica reservado para que downloads simultâneos não colidam,
+    até ser liberado com release_path().
+    """
+    with _RESERVED_LOCK:
+        cand = base
+        if cand.exists() or cand in _RESERVED_PATHS:
+            cand = base.with_stem(f"{base.stem}.{uuid.uuid4().hex[:8]}")
+        _RESERVED_PATHS.add(cand)
+        return cand
+
+def release_path(path: Path) -> None:
+    """Libera a reserva feita por dedupe_path (arquivo criado ou tentativa falhou)."""
+    with _RESERVED_LOCK:
+        _RESERVED_PATHS.discard(path)
+
+def part_path(path: Path) -> Path:
+    """
+    Cria um arquivo temporário exclusivo (`<nome>.<aleatório>.part`) ao lado de `path`,
+    onde o download é escrito antes de ser publicado por publish_part(). Por ser criado com O_EXCL,
+    dois processos (ex.: workers Celery) baixando o mesmo título nunca dividem o arquivo.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".part")
+    os.close(fd)
+    os.chmod(tmp, 0o666 & ~_UMASK)  # mkstemp cria com 0600
+    return Path(tmp)
+
+def publish_part(part: Path, path: Path) -> Path:
+    """
+    Move o `.part` concluído para `path` sem sobrescrever nada: a reserva de
+    dedupe_path vale só neste processo, então outro processo (ex.: outro worker
+    Celery baixando o mesmo título) pode ter publicado o mesmo nome. Com os.link
+    a criação do nome é atômica e falha com EEXIST; nesse caso, tenta um nome novo.
+    Retorna o caminho final, que pode diferir de `path`.
+    """
+    dest = path
     while True:
-        cand = base.with_name(f"{stem} ({n}){suffix}")
-        if not cand.exists():
-            return cand
-        n += 1
+        try:
+            os.link(part, dest)
+        except FileExistsError:
+            dest = dedupe_path(path)
+            release_path(dest)  # o próprio arquivo passa a ocupar o nome
+            continue
+        except OSError as e:
+            # Sistema de arquivos sem hard link: reserva o nome com um placeholder exclusivo
+            log.debug("os.link indisponível (%s); usando placeholder O_EXCL.", e)
+            try:
+                os.close(os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                dest = dedupe_path(path)
+                release_path(dest)
+                continue
+            os.replace(part, dest)
+            return dest
+        part.unlink()
+        return dest
 
 # ======================== Progresso ========================
 
@@ -93,31 +193,100 @@ class ProgressState:
     filesize: int = 0
     started_at: float = 0.0
     last_report: float = 0.0
+    last_report_bytes: int = 0
+    verbose: bool = False   # escreve a linha de progresso no terminal
+    done: int = 0           # bytes já recebidos
+
+ProgressHook = Callable[[int, int, str], None]
 
-def make_progress_cb(state: ProgressState):
+def _stream_filesize(stream) -> int:
+    try:
+        return int(getattr(stream, "filesize", 0) or 0)
+    except Exception:
+        return 0
+
+def _report(state: ProgressState, speed: int, now: float, hook: Optional[ProgressHook]) -> None:
+    """
+    Repassa (pct, MB/s, ETA) de `state` ao hook ou ao terminal.
+    Reporta só com REPORT_BYTES novos *e* REPORT_INTERVAL decorridos (no máx. 4/s,
+    cada um é uma escrita no Redis via Celery); o fim do download sempre sai.
+    """
+    done = state.done
+    finished = bool(state.filesize) and done >= state.filesize
+    if state.last_report and not finished and (
+            done - state.last_report_bytes < REPORT_BYTES
+            or (now - state.last_report) < REPORT_INTERVAL):
+        return
+    pct = done * 100 // state.filesize if state.filesize else 0
+    eta_txt = human_time((state.filesize - done) // speed) if speed else "--:--"
+    mb_s = speed >> 20
+    if hook:
+        hook(pct, mb_s, eta_txt)
+    else:
+        sys.stdout.write("\r[download] %3d%% | %4d MB/s | ETA %s" % (pct, mb_s, eta_txt))
+        sys.stdout.flush()
+    state.last_report = now
+    state.last_report_bytes = done
+
+def make_progress_cb(state: ProgressState, hook: Optional[ProgressHook] = None):
+    """
+    Callback de progresso do pytubefix.
+    Com `hook`, repassa (pct, MB/s, ETA); sem ele, escreve na linha do terminal
+    se `state.verbose` (senão não há ninguém olhando e nada é calculado).
+    """
     def _cb(stream, chunk, bytes_remaining):
+        if not hook and not state.verbose:
+            return
         if state.filesize == 0:
-            try:
-                state.filesize = int(getattr(stream, "filesize", 0) or 0)
-            except Exception:
-                state.filesize = 0
+            state.filesize = _stream_filesize(stream)
         now = time.time()
         if state.started_at == 0:
             state.started_at = now
-        if state.last_report and (now - state.last_report) < 0.25:
-            return
-        done = (state.filesize - int(bytes_remaining or 0)) if state.filesize else 0
-        pct = (done / state.filesize * 100) if state.filesize else 0
+        state.done = (state.filesize - int(bytes_remaining or 0)) if state.filesize else 0
         elapsed = now - state.started_at
-        speed = (done / (1024 * 1024)) / elapsed if elapsed > 0 else 0  # MB/s
-        eta = (state.filesize - done) / (speed * 1024 * 1024) if speed > 0 else math.inf
-        eta_txt = human_time(int(eta)) if math.isfinite(eta) else "--:--"
-        sys.stdout.write(f"\r[download] {pct:6.2f}% | {speed:6.2f} MB/s | ETA {eta_txt}")
-        sys.stdout.flush()
-        state.last_report = now
+        speed = int(state.done / elapsed) if elapsed > 0 else 0  # bytes/s
+        _report(state, speed, now, hook)
     return _cb
 
-def end_progress_line():
+def make_stream_progress_cb(hook: Optional[ProgressHook] = None, verbose: bool = False):
+    """
+    Progresso agregado dos streams de um vídeo baixados juntos (ex.: vídeo + áudio):
+    o hook recebe a soma dos bytes recebidos sobre a soma dos tamanhos, em vez de
+    cada stream sobrescrever o percentual do outro. O ProgressState de cada stream
+    (itag) serve só para a taxa; a vazão total é a soma das taxas dos ativos.
+    """
+    streams: dict = {}
+    total = ProgressState(verbose=verbose)
+    lock = threading.Lock()
+
+    def _cb(stream, chunk, bytes_remaining):
+        if not hook and not verbose:
+            return
+        key = getattr(stream, "itag", None)
+        now = time.time()
+        with lock:
+            st = streams.get(key)
+            if st is None:
+                st = streams[key] = ProgressState(filesize=_stream_filesize(stream), started_at=now)
+            done = (st.filesize - int(bytes_remaining or 0)) if st.filesize else 0
+            if done < st.done:
+                # Nova tentativa do mesmo stream: recomeça a medição
+                st.started_at = now
+                total.last_report = 0.0
+            st.done = done
+            total.filesize = sum(s.filesize for s in streams.values())
+            total.done = sum(s.done for s in streams.values())
+            speed = 0
+            for s in streams.values():
+                elapsed = now - s.started_at
+                if s.done < s.filesize and elapsed > 0:
+                    speed += int(s.done / elapsed)
+            _report(total, speed, now, hook)
+    return _cb
+
+def end_progress_line(verbose: bool = True):
+    if not verbose:
+        return
     sys.stdout.write("\n")
     sys.stdout.flush()
 
@@ -125,14 +294,22 @@ def end_progress_line():
 
 def pick_quality(target: str) -> str:
     t = (target or "").lower().strip()
-    if t in QUALIDADES:
+    if t in _QUALIDADES_SET:
         return t
-    m = re.fullmatch(r"(\d{3,4})p?", t)
-    if m:
-        t = f"{m.group(1)}p"
-        return t if t in QUALIDADES else "best"
+    core = t[:-1] if t.endswith("p") else t
+    if core.isascii() and core.isdigit() and len(core) in (3, 4):
+        cand = f"{core}p"
+        return cand if cand in _QUALIDADES_SET else "best"
     return "best"
 
+def _digits(value: str) -> int:
+    return int("".join(filter(str.isdigit, value or "")) or 0)
+
+def _best(streams: list, attr: str):
+    """Equivale a `.order_by(attr).desc().first()` do pytubefix, sobre uma lista."""
+    cands = [s for s in streams if getattr(s, attr, None) is not None]
+    return max(reversed(cands), key=lambda s: _digits(getattr(s, attr)), default=None)
+
 def select_streams(yt: YouTube, qualidade: str, audio_only: bool, video_only: bool) -> Tuple[Optional[object], Optional[object], bool]:
     """
     Retorna (video_stream, audio_stream, need_merge).
@@ -143,32 +320,35 @@ def select_streams(yt: YouTube, qualidade: str, audio_only: bool, video_only: bo
     """
     q = pick_quality(qualidade)
 
+    # Uma única passada pela lista de streams, separando por papel
+    all_streams = list(yt.streams)
+    videos = [s for s in all_streams if s.includes_video_track and not s.includes_audio_track]
+    audios = [s for s in all_streams if s.includes_audio_track and not s.includes_video_track]
+    progs = [s for s in all_streams if s.is_progressive]
+
     if audio_only:
-        a = yt.streams.filter(only_audio=True).order_by("abr").desc().first()
-        return None, a, False
+        return None, _best(audios, "abr"), False
 
+    best_video = _best(videos, "resolution")
     if video_only:
         if q == "best":
-            v = yt.streams.filter(only_video=True).order_by("resolution").desc().first()
+            v = best_video
         else:
-            v = yt.streams.filter(only_video=True, res=q).first() or \
-                yt.streams.filter(only_video=True).order_by("resolution").desc().first()
+            v = next((s for s in videos if s.resolution == q), None) or best_video
         return v, None, False
 
     # Tenta progressive
-    prog = yt.streams.filter(progressive=True)
     if q != "best":
-        cand = prog.filter(res=q).order_by("resolution").desc().first()
+        cand = _best([s for s in progs if s.resolution == q], "resolution")
         if cand:
             return cand, None, False
-    best_prog = prog.order_by("resolution").desc().first()
+    best_prog = _best(progs, "resolution")
 
     # Tenta adaptive (mais comum para 1080p+)
-    v = (yt.streams.filter(only_video=True, res=q).first()
-         if q != "best" else yt.streams.filter(only_video=True).order_by("resolution").desc().first())
+    v = next((s for s in videos if s.resolution == q), None) if q != "best" else best_video
     if not v:
-        v = yt.streams.filter(only_video=True).order_by("resolution").desc().first()
-    a = yt.streams.filter(only_audio=True).order_by("abr").desc().first()
+        v = best_video
+    a = _best(audios, "abr")
     if v and a:
         return v, a, True
 
@@ -180,40 +360,496 @@ def select_streams(yt: YouTube, qualidade: str, audio_only: bool, video_only: bo
 
 # ======================== FFmpeg / Merge ========================
 
+@functools.lru_cache(maxsize=1)
+def ffmpeg_path() -> Optional[str]:
+    """Caminho absoluto do ffmpeg no PATH (resolvido uma única vez)."""
+    return shutil.which("ffmpeg")
+
+@functools.lru_cache(maxsize=1)
 def has_ffmpeg() -> bool:
-    return bool(shutil.which("ffmpeg"))
+    return ffmpeg_path() is not None
 
-def merge_av(video_path: Path, audio_path: Path, out_path: Path, aac_bitrate: str = "192k") -> Path:
+@functools.lru_cache(maxsize=1)
+def ffprobe_path() -> Optional[str]:
+    return shutil.which("ffprobe")
+
+@functools.lru_cache(maxsize=1)
+def available_encoders() -> frozenset[str]:
+    """Encoders com que o ffmpeg local foi compilado (ex.: "h264_nvenc", "libx264")."""
+    exe = ffmpeg_path()
+    if not exe:
+        return frozenset()
+    try:
+        out = subprocess.check_output([exe, "-hide_banner", "-encoders"], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    names = set()
+    for line in out.decode(errors="ignore").splitlines():
+        parts = line.split()
+        # Linhas de encoder: " V....D h264_nvenc  NVIDIA NVENC H.264 encoder"
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS":
+            names.add(parts[1])
+    return frozenset(names)
+
+# Encoders de hardware que falharam nesta máquina (compilados, mas sem GPU/driver)
+_FAILED_ENCODERS: set[str] = set()
+
+def video_encoder() -> str:
+    """Encoder H.264 para reencode de vídeo: NVENC, depois QSV, senão libx264 (CPU)."""
+    encoders = available_encoders()
+    for name in HW_VIDEO_ENCODERS:
+        if name in encoders and name not in _FAILED_ENCODERS:
+            return name
+    return "libx264"
+
+def audio_codec(p: Path) -> Optional[str]:
+    """Codec da primeira faixa de áudio (ex.: "aac", "opus"), via ffprobe. None se não der para detectar."""
+    exe = ffprobe_path()
+    if not exe:
+        return None
+    try:
+        out = subprocess.check_output(
+            [exe, "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "stream=codec_name", "-of", "default=nw=1:nk=1", str(p)],
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode(errors="ignore").strip() or None
+
+def merge_av(
+    video_path: Path | str,
+    audio_path: Path | str,
+    out_path: Path,
+    aac_bitrate: str = "192k",
+    audio_is_webm: Optional[bool] = None,
+    reencode_video: bool = False,
+) -> Path:
     """
     Gera MP4 final:
-      - Vídeo: copy
-      - Áudio: se .webm/opus → reencode AAC; senão copy
+      - Vídeo: copy (ou H.264 via video_encoder() com `reencode_video`)
+      - Áudio: AAC → copy; outros codecs (opus/vorbis…) → reencode AAC
       - -movflags +faststart
+    O codec do áudio local é detectado com ffprobe; sem ffprobe, cai no sufixo (.webm).
+    As entradas podem ser arquivos locais ou URLs HTTP (o ffmpeg lê direto da rede);
+    para URLs, informe `audio_is_webm`, já que não há sufixo para inspecionar.
     """
     out_path = out_path.with_suffix(".mp4")
-    audio_is_webm = audio_path.suffix.lower() == ".webm"
-
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", str(video_path),
-        "-i", str(audio_path),
-        "-map", "0:v:0", "-map", "1:a:0",
-        "-c:v", "copy",
-    ]
-    if audio_is_webm:
-        cmd += ["-c:a", "aac", "-b:a", aac_bitrate]
+    codec = audio_codec(audio_path) if isinstance(audio_path, Path) else None
+    if codec:
+        copy_audio = codec == "aac"
+    elif audio_is_webm is not None:
+        copy_audio = not audio_is_webm
     else:
-        cmd += ["-c:a", "copy"]
-    cmd += ["-movflags", "+faststart", str(out_path)]
+        copy_audio = Path(audio_path).suffix.lower() != ".webm"
+
+    part = part_path(out_path)
 
-    logging.debug("FFmpeg: %s", " ".join(cmd))
-    res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    if res.returncode != 0:
-        raise RuntimeError(f"ffmpeg falhou: {res.stderr.decode(errors='ignore')[:500]}")
-    return out_path
+    def build_cmd(vcodec: str) -> List[str]:
+        cmd = [
+            ffmpeg_path() or "ffmpeg", "-y",
+            "-fflags", "+genpts",
+            "-i", str(video_path),
+            "-i", str(audio_path),
+            "-map", "0:v:0", "-map", "1:a:0",
+            "-c:v", vcodec,
+        ]
+        if copy_audio:
+            cmd += ["-c:a", "copy"]
+        else:
+            cmd += ["-c:a", "aac", "-b:a", aac_bitrate]
+        return cmd + ["-threads", "0", "-movflags", "+faststart", "-f", "mp4", str(part)]
+
+    vcodec = video_encoder() if reencode_video else "copy"
+    try:
+        while True:
+            cmd = build_cmd(vcodec)
+            log.debug("FFmpeg: %s", " ".join(cmd))
+            try:
+                run_ffmpeg(cmd)
+                break
+            except RuntimeError as e:
+                # -encoders só diz com o que o ffmpeg foi compilado, não se há GPU/driver;
+                # falhas de entrada (ex.: URL expirada) não dizem nada sobre o encoder
+                if vcodec not in HW_VIDEO_ENCODERS or not _ENCODER_ERROR_RE.search(str(e)):
+                    raise
+                _FAILED_ENCODERS.add(vcodec)
+                fallback = video_encoder()
+                reason = (str(e).splitlines() or [""])[-1]
+                log.warning("Encoder %s falhou (%s); usando %s.", vcodec, reason, fallback)
+                vcodec = fallback
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return publish_part(part, out_path)
+
+def run_ffmpeg(cmd: List[str], tail_lines: int = 200) -> None:
+    """
+    Executa o ffmpeg consumindo o stderr linha a linha numa thread,
+    guardando só as últimas `tail_lines` linhas para a mensagem de erro.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, errors="ignore")
+    tail: deque[str] = deque(maxlen=tail_lines)
+
+    def _drain() -> None:
+        for line in proc.stderr:
+            tail.append(line.rstrip())
+
+    reader = threading.Thread(target=_drain, daemon=True)
+    reader.start()
+    returncode = proc.wait()
+    reader.join()
+    if returncode != 0:
+        log_tail = "\n".join(tail)
+        raise RuntimeError(f"ffmpeg falhou:\n{log_tail}")
 
 # ======================== Download ========================
 
+def retry_delay(attempt: int) -> float:
+    """Backoff exponencial com jitter, para que falhas simultâneas não voltem todas no mesmo instante."""
+    return (1.5 ** attempt) * random.uniform(0.7, 1.3)
+
+def use_direct_io(size: int) -> bool:
+    return sys.platform == "linux" and hasattr(os, "O_DIRECT") and size >= DIRECT_MIN_SIZE
+
+class DirectWriter:
+    """
+    Grava em `path` com O_DIRECT, sem passar pelo page cache.
+    Os dados são acumulados num buffer mmap (alinhado à página) e escritos em
+    blocos de `chunk` bytes; a cauda que não fecha um múltiplo de `align` vai
+    por escrita normal no close(). Se o sistema de arquivos recusar O_DIRECT
+    (EINVAL/EOPNOTSUPP), o restante segue por escrita com buffer.
+    """
+
+    def __init__(self, path: Path, align: int = DIRECT_ALIGN, chunk: int = DIRECT_CHUNK):
+        self.path = path
+        self.align = align
+        self.chunk = chunk
+        self.written = 0
+        self._fh: Optional[BinaryIO] = None
+        self._fd: Optional[int] = None
+        self._failed = False  # uma escrita falhou (ex.: ENOSPC): o close() não tenta de novo
+        try:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        except OSError as e:
+            if e.errno not in _DIRECT_UNSUPPORTED:
+                raise
+            log.debug("O_DIRECT indisponível em %s; usando escrita com buffer.", path.parent)
+            self._fh = open(path, "wb", buffering=WRITE_BUFFER)
+            return
+        self._buf = mmap.mmap(-1, chunk)
+        self._view = memoryview(self._buf)
+        self._filled = 0
+
+    def write(self, data: bytes) -> None:
+        if self._fh:
+            self._fh.write(data)
+            return
+        mv = memoryview(data)
+        while mv:
+            n = min(self.chunk - self._filled, len(mv))
+            self._view[self._filled:self._filled + n] = mv[:n]
+            self._filled += n
+            mv = mv[n:]
+            if self._filled == self.chunk and not self._flush(self.chunk):
+                fh = self._fh
+                assert fh is not None  # _flush() abriu a escrita com buffer
+                fh.write(mv)
+                return
+
+    def _flush(self, upto: int) -> bool:
+        """Escreve buffer[:upto] com O_DIRECT. False se caiu para escrita com buffer."""
+        fd = self._fd
+        assert fd is not None
+        flushed = 0
+        refused = False
+        try:
+            while flushed < upto:
+                k = os.write(fd, self._view[flushed:upto])
+                flushed += k
+                self.written += k
+        except OSError as e:
+            if e.errno not in _DIRECT_UNSUPPORTED:
+                self._failed = True
+                raise
+            refused = True
+        # Fora do except: o traceback ainda seguraria a fatia do mmap, impedindo o close
+        if refused:
+            log.debug("O_DIRECT recusado em %s; usando escrita com buffer.", self.path.parent)
+            pending = bytes(self._view[flushed:self._filled])
+            self._close_direct()
+            self._fh = open(self.path, "r+b", buffering=WRITE_BUFFER)
+            self._fh.seek(self.written)
+            self._fh.truncate()
+            self._fh.write(pending)
+            return False
+        rest = bytes(self._view[upto:self._filled])
+        self._view[:len(rest)] = rest
+        self._filled = len(rest)
+        return True
+
+    def _close_direct(self) -> None:
+        fd = self._fd
+        if fd is None:
+            return
+        self._fd = None
+        os.close(fd)
+        self._view.release()
+        try:
+            self._buf.close()
+        except BufferError:
+            pass  # fatia ainda referenciada por um traceback em curso; o GC libera depois
+
+    def close(self) -> None:
+        # fd, mmap e arquivo são liberados mesmo que a última escrita falhe
+        try:
+            if self._fd is not None and not self._failed:
+                tail = self._filled - self._filled % self.align
+                if not tail or self._flush(tail):
+                    rest = bytes(self._view[:self._filled])
+                    self._close_direct()
+                    if rest:
+                        with open(self.path, "r+b") as fh:
+                            fh.seek(self.written)
+                            fh.write(rest)
+        finally:
+            self._close_direct()
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "DirectWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class AsyncDirectWriter:
+    """Adapta DirectWriter à interface de aiofiles: as escritas rodam numa thread."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._writer: Optional[DirectWriter] = None
+
+    async def write(self, data: bytes) -> None:
+        assert self._writer is not None, "use dentro de `async with`"
+        await asyncio.to_thread(self._writer.write, data)
+
+    async def __aenter__(self) -> "AsyncDirectWriter":
+        self._writer = await asyncio.to_thread(DirectWriter, self.path)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.close)
+
+def write_direct(path: Path, chunks: Iterable[bytes], align: int = DIRECT_ALIGN, chunk: int = DIRECT_CHUNK) -> None:
+    """Grava `chunks` em `path` com DirectWriter (O_DIRECT, com fallback)."""
+    with DirectWriter(path, align, chunk) as writer:
+        for data in chunks:
+            writer.write(data)
+
+def download_stream(stream, path: Path) -> Path:
+    """
+    Baixa `stream` para `path` em ranges de RANGE_SIZE, gravando por um
+    writer com buffer de WRITE_BUFFER bytes (ou com O_DIRECT para arquivos
+    grandes no Linux). Streams SABR seguem pelo pytubefix.
+    O conteúdo vai para um `.part` exclusivo e só é publicado ao final (publish_part);
+    retorna o caminho final.
+    """
+    part = part_path(path)
+    try:
+        if getattr(stream, "is_sabr", False):
+            stream.download(output_path=str(part.parent), filename=part.name, skip_existing=False)
+        else:
+            filesize = int(stream.filesize or 0)
+
+            def chunks() -> Iterator[bytes]:
+                remaining = filesize
+                for chunk in pytube_request.stream(stream.url):
+                    yield chunk
+                    remaining -= len(chunk)
+                    stream.on_progress_for_chunks(chunk, remaining)
+
+            if use_direct_io(filesize):
+                write_direct(part, chunks())
+            else:
+                with open(part, "wb", buffering=WRITE_BUFFER) as fh:
+                    for chunk in chunks():
+                        fh.write(chunk)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return publish_part(part, path)
+
+async def download_stream_async(stream, path: Path, session: aiohttp.ClientSession) -> Path:
+    """
+    Versão assíncrona de download_stream: enquanto um bloco é gravado (aiofiles,
+    ou O_DIRECT para arquivos grandes no Linux), o próximo já está chegando pela
+    conexão HTTP (aiohttp).
+    Usa os mesmos ranges de RANGE_SIZE que o pytubefix, evitando o throttling
+    que o YouTube aplica a GETs sem range.
+    """
+    part = part_path(path)
+    filesize = int(stream.filesize or 0)
+    remaining = filesize
+    writer = AsyncDirectWriter(part) if use_direct_io(filesize) else aiofiles.open(part, "wb")
+    try:
+        async with writer as fh:
+            start = 0
+            while True:
+                url = stream.url
+                if filesize:
+                    url = f"{url}&range={start}-{min(start + RANGE_SIZE, filesize) - 1}"
+                received = 0
+                async with session.get(url) as resp:
+                    resp.raise_for_status()
+                    async for chunk in resp.content.iter_chunked(ASYNC_CHUNK):
+                        await fh.write(chunk)
+                        received += len(chunk)
+                        remaining -= len(chunk)
+                        stream.on_progress_for_chunks(chunk, remaining)
+                start += received
+                if not filesize or start >= filesize:
+                    break
+                if not received:
+                    raise RuntimeError(f"Resposta vazia no range {start}-, download incompleto.")
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return publish_part(part, path)
+
+async def _download_pair_async(v, v_path: Path, a, a_path: Path) -> list:
+    headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    async with aiohttp.ClientSession(headers=headers, timeout=HTTP_TIMEOUT) as session:
+        jobs = [
+            asyncio.create_task(download_stream_async(v, v_path, session)),
+            asyncio.create_task(download_stream_async(a, a_path, session)),
+        ]
+        # Se um falhar, o outro é cancelado (e apaga o próprio .part)
+        await asyncio.wait(jobs, return_when=asyncio.FIRST_EXCEPTION)
+        for job in jobs:
+            job.cancel()
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+def download_pair(v, v_path: Path, a, a_path: Path) -> Tuple[Path, Path]:
+    """
+    Baixa vídeo e áudio ao mesmo tempo (vêm de hosts distintos) e retorna os
+    caminhos finais de cada um. Se um dos dois falhar, o que já terminou é
+    apagado antes de propagar o erro, para não deixar órfãos na pasta.
+    Streams SABR não têm URL direta e seguem pelo pytubefix, em threads.
+    """
+    results: list
+    if getattr(v, "is_sabr", False) or getattr(a, "is_sabr", False):
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            futures = [ex.submit(download_stream, v, v_path), ex.submit(download_stream, a, a_path)]
+            results = [f.exception() or f.result() for f in futures]
+    else:
+        results = asyncio.run(_download_pair_async(v, v_path, a, a_path))
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        for r in results:
+            if isinstance(r, Path):
+                r.unlink(missing_ok=True)
+        # O erro real, não o cancelamento do outro stream
+        raise next((e for e in errors if not isinstance(e, asyncio.CancelledError)), errors[0])
+    return results[0], results[1]
+
+def _download_selected(
+    yt: YouTube,
+    title: str,
+    v,
+    a,
+    need_merge: bool,
+    outdir: Path,
+    audio_only: bool,
+    sem_merge: bool,
+    aac_bitrate: str,
+    reencode_video: bool = False,
+    verbose: bool = False,
+    direct_merge: bool = False,
+) -> Path:
+    """
+    Baixa (e, se preciso, une) os streams já escolhidos por select_streams.
+    Com `direct_merge`, o ffmpeg lê as URLs assinadas em vez dos arquivos baixados.
+    """
+    with ExitStack() as reservations:
+        def reserve(base: Path) -> Path:
+            path = dedupe_path(base)
+            reservations.callback(release_path, path)
+            return path
+
+        def discard(path: Path) -> None:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+        # Áudio-only
+        if audio_only and a:
+            base = reserve(outdir / f"{title}.m4a")
+            log.info("Baixando áudio → %s", base.name)
+            path = download_stream(a, base)
+            end_progress_line(verbose)
+            return path
+
+        # Sem merge (progressive ou fluxo único)
+        if not need_merge or sem_merge:
+            stream = v or a
+            subtype = getattr(stream, "subtype", None) or "mp4"
+            info = getattr(stream, "resolution", None) or getattr(stream, "abr", None) or "stream"
+            base = reserve(outdir / f"{title}.{subtype}")
+            log.info("Baixando (%s) → %s", info, base.name)
+            path = download_stream(stream, base)
+            end_progress_line(verbose)
+            return path
+
+        # Adaptive + merge
+        if need_merge:
+            if not has_ffmpeg():
+                log.warning("ffmpeg não encontrado. Fallback para melhor progressive, se existir.")
+                prog = yt.streams.filter(progressive=True).order_by("resolution").desc().first()
+                if prog:
+                    base = reserve(outdir / f"{title}.{prog.subtype or 'mp4'}")
+                    log.info("Baixando (progressive fallback) → %s", base.name)
+                    path = download_stream(prog, base)
+                    end_progress_line(verbose)
+                    return path
+                raise RuntimeError("Sem ffmpeg e sem progressive disponível.")
+
+            final = reserve(outdir / f"{title}.mp4")
+
+            # Opcional: ffmpeg lê as URLs assinadas e faz o mux numa passada só. Evita os
+            # temporários, mas o ffmpeg faz GETs sem range (o YouTube limita a taxa
+            # deles) e não há callback de progresso; por isso o padrão é baixar antes.
+            if direct_merge and not (getattr(v, "is_sabr", False) or getattr(a, "is_sabr", False)):
+                log.info("Unindo (ffmpeg, direto das URLs) → %s", final.name)
+                try:
+                    return merge_av(v.url, a.url, final, aac_bitrate=aac_bitrate,
+                                    audio_is_webm=a.subtype == "webm", reencode_video=reencode_video)
+                except RuntimeError as e:
+                    log.warning("Merge direto falhou (%s). Baixando os streams para o disco.", e)
+
+            v_ext = v.subtype or "mp4"
+            a_ext = a.subtype or "m4a"
+            v_path = reserve(outdir / f"{title}.video.{v_ext}")
+            a_path = reserve(outdir / f"{title}.audio.{a_ext}")
+
+            log.info("Baixando VÍDEO → %s | ÁUDIO → %s", v_path.name, a_path.name)
+            v_path, a_path = download_pair(v, v_path, a, a_path)
+            # Temporários são apagados ao sair, com ou sem sucesso no merge: uma
+            # tentativa que falhou não deixa centenas de MB órfãos na pasta.
+            reservations.callback(discard, v_path)
+            reservations.callback(discard, a_path)
+            end_progress_line(verbose)
+
+            log.info("Unindo (ffmpeg) → %s", final.name)
+            return merge_av(v_path, a_path, final, aac_bitrate=aac_bitrate,
+                            reencode_video=reencode_video)
+
+        raise RuntimeError("Fluxo inesperado de seleção de streams.")
+
 def download_single(
     url: str,
     outdir: Path,
@@ -222,91 +858,102 @@ def download_single(
     video_only: bool = False,
     sem_merge: bool = False,
     aac_bitrate: str = "192k",
+    progress_hook: Optional[ProgressHook] = None,
+    reencode_video: bool = False,
+    tentativas: int = TENTATIVAS,
+    verbose: bool = False,
+    direct_merge: bool = False,
+    raise_on_failure: bool = False,
 ) -> Optional[Path]:
-    for attempt in range(1, 4):
+    """
+    Baixa um vídeo e retorna o caminho final, ou None após `tentativas` falhas.
+    Com `raise_on_failure`, a exceção da última tentativa é propagada (ex.: para
+    a tarefa Celery mostrar a causa real ao usuário).
+    """
+    # Metadados e streams são resolvidos uma vez; as novas tentativas só
+    # repetem o download, a menos que a URL assinada tenha expirado.
+    yt: Optional[YouTube] = None
+    for attempt in range(1, tentativas + 1):
         try:
-            prog_state = ProgressState()
-            yt = YouTube(url, on_progress_callback=make_progress_cb(prog_state))
-            title = sanitize_filename(yt.title or "video")
-            author = getattr(yt, "author", "?")
-            length = human_time(getattr(yt, "length", 0))
-            logging.info('Vídeo: "%s" | Autor: %s | Duração: %s', title, author, length)
-
-            v, a, need_merge = select_streams(yt, qualidade, audio_only, video_only)
-
-            # Áudio-only
-            if audio_only and a:
-                base = dedupe_path(outdir / f"{title}.m4a")
-                logging.info("Baixando áudio → %s", base.name)
-                path = a.download(output_path=outdir, filename=base.name)
-                end_progress_line()
-                return Path(path)
-
-            # Sem merge (progressive ou fluxo único)
-            if not need_merge or sem_merge:
-                stream = v or a
-                subtype = getattr(stream, "subtype", None) or "mp4"
-                info = getattr(stream, "resolution", None) or getattr(stream, "abr", None) or "stream"
-                base = dedupe_path(outdir / f"{title}.{subtype}")
-                logging.info("Baixando (%s) → %s", info, base.name)
-                path = stream.download(output_path=outdir, filename=base.name)
-                end_progress_line()
-                return Path(path)
-
-            # Adaptive + merge
-            if need_merge:
-                if not has_ffmpeg():
-                    logging.warning("ffmpeg não encontrado. Fallback para melhor progressive, se existir.")
-                    prog = yt.streams.filter(progressive=True).order_by("resolution").desc().first()
-                    if prog:
-                        base = dedupe_path(outdir / f"{title}.{prog.subtype or 'mp4'}")
-                        logging.info("Baixando (progressive fallback) → %s", base.name)
-                        path = prog.download(output_path=outdir, filename=base.name)
-                        end_progress_line()
-                        return Path(path)
-                    raise RuntimeError("Sem ffmpeg e sem progressive disponível.")
-
-                v_ext = v.subtype or "mp4"
-                a_ext = a.subtype or "m4a"
-                v_path = dedupe_path(outdir / f"{title}.video.{v_ext}")
-                a_path = dedupe_path(outdir / f"{title}.audio.{a_ext}")
-
-                logging.info("Baixando VÍDEO → %s", v_path.name)
-                v.download(output_path=outdir, filename=v_path.name)
-                end_progress_line()
-
-                logging.info("Baixando ÁUDIO → %s", a_path.name)
-                a.download(output_path=outdir, filename=a_path.name)
-                end_progress_line()
-
-                final = dedupe_path(outdir / f"{title}.mp4")
-                logging.info("Unindo (ffmpeg) → %s", final.name)
-                merged = merge_av(v_path, a_path, final, aac_bitrate=aac_bitrate)
-
-                # Limpando temporários
-                try:
-                    v_path.unlink(missing_ok=True)
-                    a_path.unlink(missing_ok=True)
-                except Exception:
-                    pass
-
-                return merged
+            if yt is None:
+                fresh = YouTube(url, on_progress_callback=make_stream_progress_cb(progress_hook, verbose))
+                title = sanitize_filename(fresh.title or "video")
+                if log.isEnabledFor(logging.INFO):
+                    # author/length são propriedades do pytubefix que podem reconsultar os metadados
+                    log.info('Vídeo: "%s" | Autor: %s | Duração: %s', title,
+                             getattr(fresh, "author", "?"), human_time(getattr(fresh, "length", 0)))
+                v, a, need_merge = select_streams(fresh, qualidade, audio_only, video_only)
+                yt = fresh
 
-            raise RuntimeError("Fluxo inesperado de seleção de streams.")
+            return _download_selected(yt, title, v, a, need_merge, outdir,
+                                      audio_only, sem_merge, aac_bitrate, reencode_video,
+                                      verbose, direct_merge)
 
         except Exception as e:
-            end_progress_line()
-            logging.warning("Tentativa %d falhou: %s", attempt, e)
-            if attempt == 3:
-                logging.error("Falhou após 3 tentativas.")
+            end_progress_line(verbose)
+            if isinstance(e, (RegexMatchError, HTTPError, aiohttp.ClientResponseError)):
+                yt = None  # URL expirada ou página mudou: recarrega na próxima tentativa
+            log.warning("Tentativa %d falhou: %s", attempt, e)
+            if attempt == tentativas:
+                log.error("Falhou após %d tentativas.", tentativas)
+                if raise_on_failure:
+                    raise
                 return None
-            wait = 1.5 ** attempt
-            logging.info("Aguardando %.1fs para tentar novamente…", wait)
+            wait = retry_delay(attempt)
+            log.info("Aguardando %.1fs para tentar novamente…", wait)
             time.sleep(wait)
 
 def is_playlist_url(url: str) -> bool:
     return "list=" in (url or "")
 
+def _playlist_cache(url: str, outdir: Path, suffix: str = ".json") -> Optional[Path]:
+    m = _PLAYLIST_ID_RE.search(url)
+    return outdir / PLAYLIST_CACHE_DIR / f"{m.group(1)}{suffix}" if m else None
+
+def playlist_video_urls(url: str, outdir: Path) -> List[str]:
+    """
+    URLs dos vídeos da playlist. A lista resolvida fica em cache em
+    `outdir/.playlist_cache/<id>.json` por PLAYLIST_CACHE_TTL segundos,
+    evitando repaginar a playlist ao rodar o mesmo job de novo.
+    """
+    cache = _playlist_cache(url, outdir)
+    if cache:
+        try:
+            if time.time() - cache.stat().st_mtime < PLAYLIST_CACHE_TTL:
+                log.info("Playlist em cache: %s", cache.name)
+                return list(json.loads(cache.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            pass
+
+    urls = list(Playlist(url).video_urls)
+    if cache:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            cache.write_text(json.dumps(urls), encoding="utf-8")
+        except OSError as e:
+            log.debug("Não foi possível gravar o cache da playlist: %s", e)
+    return urls
+
+def load_playlist_done(path: Optional[Path]) -> dict[str, str]:
+    """Itens já baixados da playlist (URL do vídeo → nome do arquivo em `outdir`)."""
+    if not path:
+        return {}
+    try:
+        return dict(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return {}
+
+def save_playlist_done(path: Optional[Path], done: dict[str, str]) -> None:
+    if not path:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(done), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        log.debug("Não foi possível gravar o progresso da playlist: %s", e)
+
 def download_playlist(
     url: str,
     outdir: Path,
@@ -316,15 +963,32 @@ def download_playlist(
     sem_merge: bool = False,
     max_itens: Optional[int] = None,
     aac_bitrate: str = "192k",
+    workers: int = PLAYLIST_WORKERS,
+    reencode_video: bool = False,
+    verbose: bool = False,
+    direct_merge: bool = False,
 ) -> None:
-    pl = Playlist(url)
-    urls: List[str] = list(pl.video_urls)
+    urls = playlist_video_urls(url, outdir)
     if max_itens:
         urls = urls[:max_itens]
-    logging.info("Playlist: %d itens", len(urls))
-    for i, vurl in enumerate(urls, 1):
-        logging.info("--- [%d/%d] %s", i, len(urls), vurl)
-        _ = download_single(
+    log.info("Playlist: %d itens", len(urls))
+    if not urls:
+        return
+
+    # Retomada: os itens concluídos ficam registrados por URL (não pelo título,
+    # que pode se repetir na playlist ou coincidir com outro arquivo da pasta).
+    done_file = _playlist_cache(url, outdir, ".done.json")
+    done = load_playlist_done(done_file)
+    done_lock = threading.Lock()
+
+    def _one(item: Tuple[int, str]) -> Optional[Path]:
+        i, vurl = item
+        name = done.get(vurl)
+        if name and (outdir / name).exists():
+            log.info("--- [%d/%d] Já baixado, pulando → %s", i, len(urls), name)
+            return outdir / name
+        log.info("--- [%d/%d] %s", i, len(urls), vurl)
+        path = download_single(
             url=vurl,
             outdir=outdir,
             qualidade=qualidade,
@@ -332,7 +996,19 @@ def download_playlist(
             video_only=video_only,
             sem_merge=sem_merge,
             aac_bitrate=aac_bitrate,
+            reencode_video=reencode_video,
+            verbose=verbose,
+            direct_merge=direct_merge,
         )
+        if path:
+            with done_lock:
+                done[vurl] = path.name
+                save_playlist_done(done_file, done)
+        return path
+
+    # Limitado para não disparar o rate-limit do YouTube
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as ex:
+        list(ex.map(_one, enumerate(urls, 1)))
 
 # ======================== CLI ========================
 
@@ -346,8 +1022,11 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--sem-merge", action="store_true", help="Não unir adaptativo com ffmpeg; baixa apenas um stream")
     p.add_argument("--playlist", action="store_true", help="Forçar modo playlist mesmo com URL de vídeo")
     p.add_argument("--max-itens", type=int, default=None, help="Limite de itens da playlist")
+    p.add_argument("--paralelo", type=int, default=PLAYLIST_WORKERS, help=f"Downloads simultâneos na playlist (default: {PLAYLIST_WORKERS})")
     p.add_argument("--log-level", default="INFO", help="DEBUG/INFO/WARN/ERROR (default: INFO)")
     p.add_argument("--aac-bitrate", default="192k", help="Bitrate do AAC no merge (ex.: 128k, 160k, 192k)")
+    p.add_argument("--merge-direto", action="store_true", help="ffmpeg lê as URLs direto, sem temporários (mais lento: sem range e sem progresso)")
+    p.add_argument("--reencode", action="store_true", help="Reencodar o vídeo em H.264 no merge (usa NVENC/QSV se disponível)")
     return p.parse_args()
 
 def main() -> None:
@@ -359,8 +1038,8 @@ def main() -> None:
 
     outdir = Path(args.saida).expanduser().resolve() if args.saida else default_download_dir()
     outdir.mkdir(parents=True, exist_ok=True)
-    logging.info("Saída: %s", outdir)
-    logging.info("Qualidade desejada: %s", args.qualidade)
+    log.info("Saída: %s", outdir)
+    log.info("Qualidade desejada: %s", args.qualidade)
 
     if args.playlist or is_playlist_url(args.url):
         download_playlist(
@@ -372,6 +1051,11 @@ def main() -> None:
             sem_merge=args.sem_merge,
             max_itens=args.max_itens,
             aac_bitrate=args.aac_bitrate,
+            workers=args.paralelo,
+            reencode_video=args.reencode,
+            # Com vários downloads simultâneos, as linhas "\r" se sobreporiam
+            verbose=args.paralelo <= 1,
+            direct_merge=args.merge_direto,
         )
     else:
         path = download_single(
@@ -382,11 +1066,14 @@ def main() -> None:
             video_only=args.video_only,
             sem_merge=args.sem_merge,
             aac_bitrate=args.aac_bitrate,
+            reencode_video=args.reencode,
+            verbose=True,
+            direct_merge=args.merge_direto,
         )
         if path:
-            logging.info("Concluído → %s", path.name)
+            log.info("Concluído → %s", path.name)
         else:
-            logging.error("Não foi possível concluir o download.")
+            log.error("Não foi possível concluir o download.")
 
 if __name__ == "__main__":
     main()
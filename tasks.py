@@ -0,0 +1,50 @@
+"""
+Fila de tarefas (Celery) para os downloads disparados pela interface web.
+
+Execute o worker com:
+  celery -A tasks worker --loglevel=INFO
+"""
+
+import os
+from pathlib import Path
+
+from celery import Celery
+
+import downloader
+
+celery_app = Celery(
+    "downloader",
+    broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1"),
+)
+celery_app.conf.update(
+    task_track_started=True,
+    result_expires=3600,
+)
+
+@celery_app.task(bind=True)
+def download_single_task(self, url: str, outdir: str, qualidade: str = "best") -> str:
+    """Baixa um vídeo no worker e devolve o nome do arquivo final."""
+    def report(pct: int, speed: int, eta_txt: str) -> None:
+        self.update_state(state="PROGRESS", meta={"pct": pct, "speed": speed, "eta": eta_txt})
+
+    # Uma tentativa por execução: o backoff entre tentativas fica com o Celery,
+    # liberando o worker em vez de dormir dentro da tarefa. A exceção original
+    # segue para o Celery, e a página mostra a causa real após a última tentativa.
+    try:
+        path = downloader.download_single(
+            url=url,
+            outdir=Path(outdir),
+            qualidade=qualidade,
+            progress_hook=report,
+            tentativas=1,
+            raise_on_failure=True,
+        )
+    except Exception as e:
+        raise self.retry(
+            exc=e,
+            countdown=downloader.retry_delay(self.request.retries + 1),
+            max_retries=downloader.TENTATIVAS - 1,
+        )
+    assert path is not None  # raise_on_failure: falhas chegam como exceção
+    return path.name